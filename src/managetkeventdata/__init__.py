@@ -19,7 +19,8 @@ main thread. Two kinds of proxies can be created:
     * 'ordinary' proxies which methods have a return value (like functions)
 The advantage of mute proxies is that the calling thread
 doesn't have to wait for the return value when calling a
-method.
+method. Bursts of mute proxy calls can be sent to the main
+thread at once in a 'with proxy_builder.batch():' block.
 
 The virtual events can be generated in any thread, the
 event handlers are always executed by tkinter's main thread.
@@ -76,21 +77,50 @@ Usage example with object proxy:
 __version__ = '2023.07.09'
 
 import abc
-from functools import partial
+from contextlib import contextmanager
 from collections import deque, namedtuple
 import itertools
+import sys
 import threading
 from typing import Any, Callable, Optional
 
 def init_module():
 
     # hide global objects
-    datastream = deque()
-    count = itertools.count()
-    generation_lock = threading.RLock()
-    local = threading.local()
-    dequeue = datastream.popleft
-    enqueue = datastream.append
+    # datastream maps event indices, as the strings passed through
+    # the events' data field, to the client data of the
+    # events that have been generated but not yet handled.
+    # An entry is removed only when a handler installed by bind()
+    # receives its event, so the data of events that are never
+    # delivered to such a handler stays in the datastream.
+    # A fixed-size ring buffer indexed by 'index & mask' would offer
+    # the same O(1) access but would overwrite the data of pending
+    # events if more events than its size were in flight.
+    datastream = {}
+    retrieve = datastream.pop
+    # Build SmallEvent instances with tuple.__new__(), skipping the
+    # Python-level __new__() that namedtuple generates.
+    tuple_new = tuple.__new__
+
+    if getattr(sys, '_is_gil_enabled', lambda: True)():
+        count = itertools.count()
+    else:
+        # In free-threaded builds (PEP 703), dict operations remain
+        # thread-safe but advancing an itertools.count is not
+        # guaranteed to be atomic, so it is protected by a lock.
+        class LockedCount:
+            __slots__ = ('_count', '_lock')
+
+            def __init__(self):
+                self._count = itertools.count()
+                self._lock = threading.Lock()
+
+            def __next__(self):
+                with self._lock:
+                    return next(self._count)
+
+        count = LockedCount()
+
     virtual_event = '<<managetkeventdata-call>>'
 
     def bind(
@@ -102,16 +132,27 @@ def init_module():
 
         See the documentation of tkinter.Misc.bind() for a description
         of the arguments"""
-        def _substitute(*args):
-            index = int(args[0])
-            while True:
-                n, data = dequeue()
-                if n >= index:
-                    break
-            assert n == index
-            return (SmallEvent(data, widget),)
-
-        funcid = widget._register(func, _substitute, needcleanup=1)
+        # The Tcl command is created directly instead of going through
+        # widget._register(), whose CallWrapper would call a separate
+        # substitution function on every event. This function plays
+        # both roles and handles exceptions like CallWrapper does.
+        def _dispatch(index):
+            # index is the substitution of the '%d' field of the event
+            try:
+                return func(
+                    tuple_new(SmallEvent, (retrieve(index), widget)))
+            except SystemExit:
+                raise
+            except:
+                widget._report_exception()
+
+        funcid = repr(id(_dispatch)) + getattr(func, '__name__', '')
+        widget.tk.createcommand(funcid, _dispatch)
+        # have the command deleted when the widget is destroyed,
+        # as _register(..., needcleanup=1) does.
+        if widget._tclCommands is None:
+            widget._tclCommands = []
+        widget._tclCommands.append(funcid)
         cmd = f'{"+" if add else ""}if {{"[{funcid} %d]" == "break"}} break\n'
         widget.tk.call('bind', widget._w, sequence, cmd)
 
@@ -120,18 +161,75 @@ def init_module():
         sequence: str,
         data: Any=None):
         """Generate an event SEQUENCE. Additional argument DATA
-        specifies a field .data in the generated event."""
-        with generation_lock:
-            index = next(count)
-            enqueue((index, data))
-            # when='tail': place the event on Tcl's event queue
-            # behind any events already queued for this application.
-            # This is necessary so that events are processed by the
-            # main thread and not by the current thread, and also
-            # it ensures that events are handled in the same order
-            # that the datastream is enqueued
-            widget.event_generate(
-                sequence, data=str(index), when='tail')
+        specifies a field .data in the generated event.
+
+        DATA is kept until the event is received by a handler bound
+        to SEQUENCE with bind(). If no such handler receives the event,
+        for example because SEQUENCE is not bound on WIDGET or because
+        WIDGET is destroyed before the event is processed, DATA is
+        never released."""
+        # No lock is needed here: next(count) and dict item
+        # assignment are atomic (see above), and the handler
+        # retrieves the data by its index, regardless of the order
+        # in which concurrent events reach Tcl's event queue.
+        # The index is converted to str only once: Tcl hands back
+        # the same string as the '%d' substitution in the handler.
+        index = str(next(count))
+        datastream[index] = data
+        # -when tail: place the event on Tcl's event queue
+        # behind any events already queued for this application.
+        # This is necessary so that events are processed by the
+        # main thread and not by the current thread.
+        # Calling tk.call() directly skips the option formatting
+        # of tkinter.Misc.event_generate(). Note that with a threaded
+        # Tcl, a call from another thread is handed to the main
+        # thread and blocks until the main loop has executed it.
+        try:
+            widget.tk.call(
+                'event', 'generate', widget._w, sequence,
+                '-data', index, '-when', 'tail')
+        except BaseException:
+            # no event will carry the data to a handler
+            datastream.pop(index, None)
+            raise
+
+    class ProcBatch:
+        """Batch of mute proxy method calls issued by a thread to a widget.
+
+        A single virtual event is generated on WIDGET for all the
+        calls appended to the batch while it is waiting to be drained
+        by the main thread. Each thread appends its calls to its
+        current batch and starts a new one when it calls a proxy
+        of another widget. This keeps the calls in order, and a
+        batch whose event is never delivered, for example because
+        its widget was destroyed, doesn't retain calls to other
+        widgets."""
+        __slots__ = ('widget', 'calls', 'pending')
+
+        def __init__(self, widget):
+            self.widget = widget
+            # This member holds pairs (handler, func) of method calls
+            self.calls = deque()
+            # This flag indicates that an event has been generated
+            # and that the main thread has not yet started draining
+            self.pending: bool = False
+
+        def flush(self):
+            """Have the main thread execute the calls in the batch"""
+            if self.calls and not self.pending:
+                self.pending = True
+                try:
+                    event_generate(
+                        self.widget, virtual_event, (handle_batch, self))
+                except BaseException:
+                    # The calls must not be executed later since the
+                    # caller receives the exception. Detach the batch
+                    # from the thread instead of clearing it: the main
+                    # thread may still be draining its earlier calls.
+                    self.pending = False
+                    if local.batch is self:
+                        local.batch = None
+                    raise
 
     class ReturnCell:
         """Object used to pass a return value between threads.
@@ -142,67 +240,95 @@ def init_module():
         executes the method to hold the method's return value
         or exception. The calling thread then reads these values
         in the cell."""
+        __slots__ = ('_value', 'err_flag', 'bell')
+
         def __init__(self):
             # This member holds the return value of a method call
             self._value: Any = None
             # This flag indicates that a method call raised an exception
             self.err_flag: bool = False
-            # This waitable event indicates that the cell is ready
-            # to be read after a method call has been executed
-            self.bell = threading.Event()
-
-        def set_return(self, value):
-            old_value, self._value = self._value, value
-            return old_value
-
-    main_cell_set = False
-
-    def return_cell():
-        '''Return a thread-local return cell
-
-        In the main thread, return None'''
-        nonlocal main_cell_set
-        try:
-            c = local.return_cell
-        except AttributeError:
-            if main_cell_set or (
-                threading.current_thread() is not threading.main_thread()):
-                c = ReturnCell()
-            else:
-                c = None
-                main_cell_set = True
-            local.return_cell = c
-        return c
-
-    # if we are initializing in the main thread,
-    # set main thread's cell to None immediately to avoid later checks
-    if threading.current_thread() is threading.main_thread():
-        return_cell()
+            # This lock is released by the main thread when the cell
+            # is ready to be read after a method call has been executed.
+            # It is held at all other times, so that the calling thread
+            # blocks when it acquires it and holds it again afterwards.
+            self.bell = threading.Lock()
+            self.bell.acquire()
+
+    class Local(threading.local):
+        """Thread-local storage of the module.
+
+        Its __init__() method is called in each thread on the first
+        access to the object, so that the attributes are always set."""
+        def __init__(self):
+            # The main thread executes method calls directly
+            self.in_main = (
+                threading.current_thread() is threading.main_thread())
+            # The thread's current batch of mute proxy calls
+            self.batch = None
+            # This counter is positive while the thread holds its
+            # mute proxy calls in ProxyBuilder.batch() blocks
+            self.held = 0
+            # The thread's return cell, created on its first
+            # ordinary proxy method call
+            self.return_cell = None
+
+    local = Local()
 
     # General event handler that receives all proxy method call events.
     def handle_call(event):
-        # dispatch the event to its own specific handler.
-        event.data.handler(event)
+        # dispatch the event to its own specific handler,
+        # which is the first item of the event's data.
+        event.data[0](event)
 
-    class Handler(abc.ABC):
-        """Base class of callable objects that handle virtual events"""
-        @abc.abstractmethod
-        def __call__(self, event):
-            ...
+    def _run_proc(handler, func, widget):
+        """Execute a mute proxy method call in the main thread.
 
-    class ProcHandler(Handler):
-        """Èvent handler for mute proxy method calls"""
-        def __call__(self, event):
-            event.data.func()
+        Mute proxy calls never raise: an exception that HANDLER
+        doesn't handle is reported by WIDGET as tkinter would have
+        done in an event handler."""
+        try:
+            handler.run(func)
+        except Exception:
+            widget._report_exception()
+
+    def handle_batch(event):
+        """Event handler that drains a batch of mute proxy method calls"""
+        _, batch = event.data
+        # Clear the flag before draining, so that a call submitted
+        # after the last one is popped generates a new event.
+        batch.pending = False
+        calls = batch.calls
+        try:
+            while calls:
+                handler, func = calls.popleft()
+                _run_proc(handler, func, event.widget)
+        finally:
+            if calls:
+                # The drain was interrupted by an exception that
+                # _run_proc() doesn't catch, e.g. KeyboardInterrupt.
+                # Generate a new event for the remaining calls.
+                try:
+                    batch.flush()
+                except Exception:
+                    event.widget._report_exception()
+
+    class ProcHandler:
+        """Handler for mute proxy method calls"""
+        __slots__ = ()
+
+        def run(self, func):
+            """Execute a mute proxy method call in the main thread"""
+            func()
+
+    class ProcExcHandler(ProcHandler):
+        """Handler for mute proxy method calls with exception handling"""
+        __slots__ = ('_exc_handler',)
 
-    class ProcExcHandler(Handler):
-        """Event handler for mute proxy method calls with exception handling"""
         def __init__(self, exc_handler: Callable[[Exception], Any]):
             super().__init__()
             self._exc_handler = exc_handler
 
-        def __call__(self, event):
-            func = event.data.func
+        def run(self, func):
             try:
                 func()
             except Exception as exc:
@@ -210,6 +336,8 @@ def init_module():
 
     class FuncHandler:
         """Event handler for ordinary proxy method calls with return and exception"""
+        __slots__ = ()
+
         def __call__(self, event):
             _, cell, func = event.data
             try:
@@ -220,11 +348,13 @@ def init_module():
             else:
                 err_flag = False
             cell.err_flag = err_flag
-            cell.set_return(result)
-            cell.bell.set()
+            cell._value = result
+            cell.bell.release()
 
     class Generator(abc.ABC):
         """Base class of callable objects that generate a virtual event when a proxy method is called."""
+        __slots__ = ('_handler',)
+
         def __init__(self, handler):
             self._handler = handler
 
@@ -233,31 +363,53 @@ def init_module():
             ...
 
     class ProcGenerator(Generator):
-        """Generate an event when a mute proxy method is called"""
-        EventData = namedtuple('EventData', 'handler func')
+        """Generate an event when a mute proxy method is called.
+
+        Calls issued by a thread to the same widget while a previous
+        event of the thread is still pending are added to this event's
+        batch."""
+        __slots__ = ()
 
         def __call__(self, widget, func):
-            event_generate(
-                widget, virtual_event, self.EventData(self._handler, func))
+            if local.in_main:
+                # if in main thread, call the method directly
+                _run_proc(self._handler, func, widget)
+                return
+            batch = local.batch
+            if batch is None or batch.widget is not widget:
+                # send the calls held for another widget first
+                if batch is not None:
+                    batch.flush()
+                batch = local.batch = ProcBatch(widget)
+            batch.calls.append((self._handler, func))
+            if not local.held:
+                batch.flush()
 
     class FuncGenerator(Generator):
         """Generate an event when an ordinary proxy's method is called"""
-        EventData = namedtuple('EventData', 'handler cell func')
+        __slots__ = ()
 
         def __call__(self, widget, func):
-            if not (cell := return_cell()):
+            if local.in_main:
                 # if in main thread, call the method directly
                 result = func()
             else:
-                cell.bell.clear()
+                if (cell := local.return_cell) is None:
+                    cell = local.return_cell = ReturnCell()
+                # mute proxy calls held by the thread must be
+                # executed before this call
+                if local.held and (batch := local.batch) is not None:
+                    batch.flush()
                 event_generate(
                     widget,
                     virtual_event,
-                    self.EventData(self._handler, cell, func))
+                    (self._handler, cell, func))
                 # wait until the main thread handles the event
-                cell.bell.wait()
-                # read the return value or exception
-                result = cell.set_return(None)
+                cell.bell.acquire()
+                # read the return value or exception, and
+                # release the reference held by the cell
+                result = cell._value
+                cell._value = None
                 if cell.err_flag:
                     raise result
             return result
@@ -266,13 +418,24 @@ def init_module():
         generator: Generator, widget: "tkinter.Misc", obj: Any):
         """Internal function to create a Proxy object wrapping
         OBJ and using GENERATOR to send events to WIDGET when
-        the proxy's methods are called."""
+        the proxy's methods are called.
 
-        def method(func, *args, **kwargs):
-            return generator(widget, partial(func, *args, **kwargs))
+        The proxy's methods are created on first access and cached,
+        trading a little memory for call throughput. As a consequence,
+        attributes of OBJ are read only once by the proxy."""
+        methods = {}
 
         def _getattr(name):
-            return partial(method, getattr(obj, name))
+            try:
+                return methods[name]
+            except KeyError:
+                pass
+            func = getattr(obj, name)
+
+            def method(*args, **kwargs):
+                return generator(widget, lambda: func(*args, **kwargs))
+
+            return methods.setdefault(name, method)
 
         return Proxy(_getattr)
 
@@ -301,6 +464,37 @@ def init_module():
             or exceptions raised to the calling thread."""
             return make_proxy(FuncGenerator(FuncHandler()), self._widget, obj)
 
+        @contextmanager
+        def batch(self):
+            """Context manager holding the current thread's mute proxy calls.
+
+            The hold applies to the calls made by the thread in the
+            with block on all mute proxies, whichever ProxyBuilder
+            created them. Consecutive calls to proxies of the same
+            widget are sent to the main thread in a single virtual
+            event when the block exits, before an ordinary proxy method
+            call, or when the thread calls a mute proxy of another
+            widget. Blocks can be nested. In the main thread, calls
+            are still executed immediately."""
+            if local.in_main:
+                yield
+                return
+            local.held += 1
+            try:
+                yield
+            except BaseException:
+                local.held -= 1
+                # send the held calls without hiding the exception
+                if not local.held and (batch := local.batch) is not None:
+                    try:
+                        batch.flush()
+                    except Exception:
+                        pass
+                raise
+            local.held -= 1
+            if not local.held and (batch := local.batch) is not None:
+                batch.flush()
+
 
     # Only a few names are made available in the module's global
     # namespace. They constitute the public interface of this module.
@@ -315,6 +509,8 @@ del init_module
 SmallEvent = namedtuple('SmallEvent', 'data widget')
 
 class Proxy:
+    __slots__ = ('_getattr', '__weakref__')
+
     def __init__(self, getattr):
         self._getattr = getattr
 
@@ -30,8 +30,10 @@ if __name__ == '__main__':
 
         for i in range(3):
             value = f'origin:{name}, loop:{i}'
-            proxy.print(f"{name:16} calling proxy.eggs({value!r})")
-            proxy.eggs(value)
+            # send both calls to the main thread in one event
+            with pb.batch():
+                proxy.print(f"{name:16} calling proxy.eggs({value!r})")
+                proxy.eggs(value)
             time.sleep(1)
 
         y = 13